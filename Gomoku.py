@@ -1,10 +1,16 @@
 #!/usr/bin/env python3
+from __future__ import annotations
 import time  # Import time module for delay
 import sys
 import random
 import logging
+import json
 import math
+import multiprocessing
 import tracemalloc
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import product
+from operator import itemgetter
 
 tracemalloc.start()
 
@@ -29,11 +35,18 @@ logging.basicConfig(
 # Uncomment the below line to disable logging
 logging.disable("DEBUG")
 
+# Set to True to log the AI's search and each board state; the checks keep the hot paths free of log formatting
+DEBUG_AI = False
+
 # Define board size and piece representations
+# Pieces are small integers so a cell times the AI's piece gives the 1/-1/0 alphabet of PATTERN_DICT
 BOARD_SIZE = 15
-WHITE_PIECE = 'W'
-BLACK_PIECE = 'B'
-EMPTY = '.'
+WHITE_PIECE = -1
+BLACK_PIECE = 1
+EMPTY = 0
+
+# Characters used to render each piece on screen and in the log
+PIECE_SYMBOLS = {WHITE_PIECE: 'W', BLACK_PIECE: 'B', EMPTY: '.'}
 
 # Define directions for later checking: right, down, diagonal down-right, diagonal down-left
 DIRECTIONS = [(1, 0), (0, 1), (1, 1), (-1, 1)]
@@ -41,22 +54,153 @@ DIRECTIONS = [(1, 0), (0, 1), (1, 1), (-1, 1)]
 # Time limit for AI search in seconds
 TIME_LIMIT = 10
 
+# Milliseconds between checks on the AI's search while the game waits for it and keeps reading keys
+AI_POLL_INTERVAL = 100
+
 # AI search radius for possible moves
 SEARCH_RADIUS = 2
 
-# AI search depth for minimax
+# AI search depth for negamax
 DEPTH = 4
 
+# Score of a five-in-a-row pattern; kept finite so running scores can be added to and subtracted from
+WIN_SCORE = 10 ** 9
+
+# Maximum number of scored lines kept in line_table before it is emptied
+LINE_TABLE_LIMIT = 1 << 18
+
 # Initialize an empty game board
-board = [[EMPTY for _ in range(BOARD_SIZE)] for _ in range(BOARD_SIZE)]
+# The board is one flat list; the cell at (x, y) is board[y * BOARD_SIZE + x], called its position
+board = [EMPTY] * (BOARD_SIZE * BOARD_SIZE)
 cursor_x, cursor_y = BOARD_SIZE // 2, BOARD_SIZE // 2 # start in the middle
 turn = WHITE_PIECE  # White player starts
 
+# What print_board last drew in each cell, as (piece, attribute), so unchanged cells can be skipped
+drawn_cells = [None] * (BOARD_SIZE * BOARD_SIZE)
+
+# Candidate moves: every empty cell within SEARCH_RADIUS of a piece, kept up to date by place_piece and undo_piece
+# neighbor_counts[pos] is the number of pieces within SEARCH_RADIUS of the cell at position pos
+candidates: set[int] = set()
+neighbor_counts = [0] * (BOARD_SIZE * BOARD_SIZE)
+
 # Zobrist Hashing (if needed for further optimizations)
-# Table indexing is ZOBRIST_TABLE[y][x][p], where p = 0 for white and p = 1 for black
-ZOBRIST_TABLE = [[[random.getrandbits(64) for _ in range(2)] for _ in range(BOARD_SIZE)] for _ in range(BOARD_SIZE)]
-trans_table = {}
-board_hash = 0
+# Table indexing is ZOBRIST_TABLE[pos][p], where p = 0 for white and p = 1 for black
+# The keys come from a fixed seed so that a position has the same hash in every run, as the opening book needs
+zobrist_random = random.Random(481)
+ZOBRIST_TABLE = [[zobrist_random.getrandbits(64) for _ in range(2)] for _ in range(BOARD_SIZE * BOARD_SIZE)]
+
+def create_symmetries():
+    """
+    Creates the position maps of the 8 symmetries of the board (4 rotations, each optionally mirrored).
+
+    Returns:
+        list: symmetries[k][pos] is the position that pos moves to under symmetry k; k = 0 is the identity.
+    """
+    last = BOARD_SIZE - 1
+    symmetries = []
+    for mirrored in (False, True):
+        for rotation in range(4):
+            positions = []
+            for y in range(BOARD_SIZE):
+                for x in range(BOARD_SIZE):
+                    tx, ty = (last - x, y) if mirrored else (x, y)
+                    for _ in range(rotation):
+                        tx, ty = last - ty, tx  # Rotate a quarter turn
+                    positions.append(ty * BOARD_SIZE + tx)
+            symmetries.append(positions)
+    return symmetries
+
+SYMMETRIES = create_symmetries()
+# INVERSE_SYMMETRIES[k][pos] is the position that symmetry k moves to pos
+INVERSE_SYMMETRIES = [[None] * (BOARD_SIZE * BOARD_SIZE) for _ in SYMMETRIES]
+for k, positions in enumerate(SYMMETRIES):
+    for pos, moved in enumerate(positions):
+        INVERSE_SYMMETRIES[k][moved] = pos
+
+# symmetry_hashes[k] is the hash of the board transformed by symmetry k; ZOBRIST_SYMMETRY[pos][p] holds
+# the 8 keys a piece at pos adds, so place_piece and undo_piece keep all of them up to date together
+ZOBRIST_SYMMETRY = [tuple(tuple(ZOBRIST_TABLE[positions[pos]][p] for positions in SYMMETRIES) for p in range(2))
+                    for pos in range(BOARD_SIZE * BOARD_SIZE)]
+symmetry_hashes = [0] * len(SYMMETRIES)
+SIDE_KEY = zobrist_random.getrandbits(64)  # Mixed into evaluation keys for Black, and into the hashes after a null move
+
+# Search results live in a fixed-size table of TT_BUCKETS buckets, picked by the low bits of the smallest of
+# symmetry_hashes; slot 2 * i of bucket i keeps the deepest result and slot 2 * i + 1 the most recent one,
+# each as (key, value, depth, flag, best_move)
+TT_BUCKETS = 1 << 18
+trans_table: list[tuple | None] = [None] * (2 * TT_BUCKETS)
+eval_table = {}   # Static evaluations: board hash -> score
+line_table = {}   # Line scores: (center, line) -> summed score of the windows covering the center, or all of them
+                  # when center is None
+
+# Transposition table flags: the stored value is exact, a lower bound (fail-high) or an upper bound (fail-low)
+EXACT, LOWER, UPPER = 0, 1, 2
+
+def probe_transposition(key: int):
+    """
+    Looks up the search result stored for a position.
+
+    Args:
+        key (int): The position's hash.
+
+    Returns:
+        entry (tuple): The (key, value, depth, flag, best_move) entry of the position, or None if it is not stored.
+    """
+    index = (key & (TT_BUCKETS - 1)) << 1
+    entry = trans_table[index]
+    if entry is not None and entry[0] == key:
+        return entry
+    entry = trans_table[index + 1]
+    if entry is not None and entry[0] == key:
+        return entry
+    return None
+
+def store_transposition(key: int, value: float, depth: int, flag: int, best_move: int | None):
+    """
+    Stores a search result, in the deepest slot of its bucket if it is at least as deep as the result there
+    and in the most recent slot otherwise.
+
+    Args:
+        key (int): The position's hash.
+        value (float): The score of the position for the side to move.
+        depth (int): The remaining depth the position was searched to.
+        flag (int): Whether value is EXACT, a LOWER bound or an UPPER bound.
+        best_move (int): The position of the best move found, or None.
+    """
+    index = (key & (TT_BUCKETS - 1)) << 1
+    deepest = trans_table[index]
+    if deepest is None or depth >= deepest[2]:
+        trans_table[index] = (key, value, depth, flag, best_move)
+    else:
+        trans_table[index + 1] = (key, value, depth, flag, best_move)
+
+# Move ordering aids, filled in by cutoffs during the search
+# killer_moves[depth] holds the last two moves that caused a cutoff at that remaining depth
+# history_scores[pos] grows by depth * depth each time the move at pos causes a cutoff
+killer_moves = [[None, None] for _ in range(DEPTH + 1)]
+history_scores = [0] * (BOARD_SIZE * BOARD_SIZE)
+
+# Sort key for (move, score) pairs, shared by every node instead of a new lambda per sort
+BY_SCORE = itemgetter(1)
+
+# Half-width of the window around the previous iteration's score that each deeper iteration searches first
+ASPIRATION_WINDOW = 500
+
+# Extra depth reduction of the search after a null move
+NULL_MOVE_REDUCTION = 2
+
+# Processes that search the root moves after the first one in parallel; with one, the search stays in this process.
+# More workers search more nodes but start a new pool for every AI move, and no speedup has been measured yet
+ROOT_WORKERS = 1
+
+# In a root search worker, the best root score found so far, shared with the process that started it
+root_alpha = None
+
+# Moves searched to the full DEPTH in positions with at most OPENING_BOOK_PLIES pieces are saved in
+# OPENING_BOOK_FILE and played again without a search in later games; 0 turns the book off
+OPENING_BOOK_PLIES = 6
+OPENING_BOOK_FILE = 'gomoku_opening_book.json'
+opening_book: dict[int, tuple[int, int]] | None = None  # Position key -> (move, depth), loaded on first use
 
 # Metrics
 state_count = 0
@@ -87,7 +231,7 @@ def create_pattern_dict():
     for x in [-1, 1]:  # -1 for opponent, 1 for AI
         y = -x
         # Five-in-a-row (Victory)
-        pattern_dict[(x, x, x, x, x)]       = math.inf * x
+        pattern_dict[(x, x, x, x, x)]       = WIN_SCORE * x
         # Open-ended four-in-a-row
         pattern_dict[(0, x, x, x, x, 0)]    = 100000 * x
         # One-and-Three
@@ -109,6 +253,7 @@ def create_pattern_dict():
         pattern_dict[(0, x, x, 0, x, 0)]    = 1000 * x
         # Open-ended two-in-a-row (early game potential)
         pattern_dict[(0, 0, x, x, 0)]       = 100 * x
+        pattern_dict[(0, x, x, 0, 0)]       = 100 * x
     return pattern_dict
 
 def get_possible_pattern_lengths(pattern_dict: dict):
@@ -117,7 +262,7 @@ def get_possible_pattern_lengths(pattern_dict: dict):
     for key in pattern_dict:
         possible_lengths.add(len(key))
 
-    return possible_lengths
+    return tuple(sorted(possible_lengths))  # A fixed order for the window loops, which only iterate it
 
 
 # Generate the global pattern dictionary
@@ -127,6 +272,127 @@ POSSIBLE_PATTERN_LENGTHS = get_possible_pattern_lengths(PATTERN_DICT)
 
 MAX_PATTERN_LENGTH = max(POSSIBLE_PATTERN_LENGTHS)
 
+def create_board_lines():
+    """
+    Lists every full row, column and diagonal of the board that is long enough to hold a pattern.
+
+    Returns:
+        lines (list): One tuple of positions per line, in order along its direction.
+    """
+    lines = []
+    for dx, dy in DIRECTIONS:
+        for y in range(BOARD_SIZE):
+            for x in range(BOARD_SIZE):
+                # A line starts at the cell whose predecessor in its direction is off the board
+                if 0 <= x - dx < BOARD_SIZE and 0 <= y - dy < BOARD_SIZE:
+                    continue
+                line = []
+                nx, ny = x, y
+                while 0 <= nx < BOARD_SIZE and 0 <= ny < BOARD_SIZE:
+                    line.append(ny * BOARD_SIZE + nx)
+                    nx, ny = nx + dx, ny + dy
+                if len(line) >= POSSIBLE_PATTERN_LENGTHS[0]:
+                    lines.append(tuple(line))
+    return lines
+
+# Precomputed lines, so evaluate_board reads every window without bounds checks
+BOARD_LINES = create_board_lines()
+
+# Reads each line of a board in one call
+LINE_GETTERS = [itemgetter(*line) for line in BOARD_LINES]
+
+def create_cell_rays():
+    """
+    Lists, for every cell, the in-bounds part of its four lines within reach of a pattern covering the cell.
+
+    Returns:
+        rays (list): rays[pos] holds one (center, cells) pair per direction in DIRECTIONS, where cells is
+        a tuple of positions in order along the direction and cells[center] is pos itself.
+    """
+    rays = []
+    for y in range(BOARD_SIZE):
+        for x in range(BOARD_SIZE):
+            cell_rays = []
+            for dx, dy in DIRECTIONS:
+                cells = []
+                center = 0
+                for i in range(1 - MAX_PATTERN_LENGTH, MAX_PATTERN_LENGTH):
+                    nx, ny = x + i * dx, y + i * dy
+                    if 0 <= nx < BOARD_SIZE and 0 <= ny < BOARD_SIZE:
+                        if i == 0:
+                            center = len(cells)
+                        cells.append(ny * BOARD_SIZE + nx)
+                cell_rays.append((center, tuple(cells)))
+            rays.append(tuple(cell_rays))
+    return rays
+
+def create_neighborhoods():
+    """
+    Lists, for every cell, the other cells within SEARCH_RADIUS of it.
+
+    Returns:
+        neighborhoods (list): neighborhoods[pos] is a tuple of positions, clipped to the board.
+    """
+    return [tuple(ny * BOARD_SIZE + nx
+                  for ny in range(max(0, y - SEARCH_RADIUS), min(BOARD_SIZE, y + SEARCH_RADIUS + 1))
+                  for nx in range(max(0, x - SEARCH_RADIUS), min(BOARD_SIZE, x + SEARCH_RADIUS + 1))
+                  if (nx, ny) != (x, y))
+            for y in range(BOARD_SIZE) for x in range(BOARD_SIZE)]
+
+# Precomputed per-cell lines and neighborhoods, so the search updates and checks a move without bounds checks
+CELL_RAYS = create_cell_rays()
+NEIGHBORHOODS = create_neighborhoods()
+
+def create_step_getters():
+    """
+    Builds, for every cell, a reader for the up to four cells on each side of it along each direction.
+
+    Returns:
+        getters (list): getters[pos] holds two callables per direction in DIRECTIONS, one for each side,
+        returning the cells going away from pos in order as a tuple, as a single value for one cell,
+        or as () at the edge of the board.
+    """
+    getters = []
+    for rays in CELL_RAYS:
+        cell_getters = []
+        for center, cells in rays:
+            for steps in (cells[center + 1:center + 5], cells[max(0, center - 4):center][::-1]):
+                cell_getters.append(itemgetter(*steps) if steps else lambda cells: ())
+        getters.append(tuple(cell_getters))
+    return getters
+
+def create_run_scores():
+    """
+    Scores every possible content of the cells read by STEP_GETTERS, for both players.
+
+    A step scores 2 for the player's piece and 1 for the opponent's, and the run stops at an empty
+    cell or a change of color. A run that reaches the edge loses one point for every missing step.
+
+    Returns:
+        run_scores (dict): run_scores[player] maps the value of a step getter to its score.
+    """
+    run_scores = {}
+    for player in (WHITE_PIECE, BLACK_PIECE):
+        scores = {}
+        for length in range(5):
+            for steps in product((WHITE_PIECE, EMPTY, BLACK_PIECE), repeat=length):
+                score = 0
+                run = EMPTY  # Color of the run of pieces next to the move
+                for cell in steps:
+                    if cell == EMPTY or (run != EMPTY and cell != run):
+                        break
+                    run = cell
+                    score += 2 if cell == player else 1
+                else:
+                    score -= 4 - length
+                scores[steps[0] if length == 1 else steps] = score  # itemgetter returns one cell unwrapped
+        run_scores[player] = scores
+    return run_scores
+
+# Lets evaluate_move_position score each side of each direction with one read of the board and one lookup
+STEP_GETTERS = create_step_getters()
+RUN_SCORES = create_run_scores()
+
 def print_banner():
     """
     Displays the game banner with version and author information.
@@ -177,16 +443,18 @@ def print_board(stdscr: curses.window):
     """
     Renders the game board on the screen using curses.
 
+    Only cells whose piece or cursor highlight changed since the previous call are redrawn.
+
     Args:
         stdscr: The curses window object.
     """
-    stdscr.clear()
     height, width = stdscr.getmaxyx()
     required_height = BOARD_SIZE + 6  # Rows needed for the board and additional text
     required_width = BOARD_SIZE * 2 + 2  # Columns needed for the board display
 
     # Check if the terminal window is large enough to display the board
     if height < required_height or width < required_width:
+        stdscr.clear()
         error_msg = f"Terminal too small. Requires at least {required_height} rows and {required_width} columns."
         try:
             stdscr.addstr(0, 0, error_msg, curses.A_BOLD)
@@ -197,34 +465,25 @@ def print_board(stdscr: curses.window):
         sys.exit(1)
 
     # Display game title and instructions
-    stdscr.addstr(0, 0, "Gomoku V1.00", curses.A_BOLD)
-    stdscr.addstr(2, 0, "Use arrow keys to move. Press 'w' to place White, 'b' to place Black. 'q' to quit.")
-
-    # Draw the board with cursor
-    for y in range(BOARD_SIZE): # Loop over each row of the board
-        for x in range(BOARD_SIZE): # Loop over each column in the current row
-            if x == cursor_x and y == cursor_y:
-                # If the current board position matches the cursor position
-                # Display the board cell with reverse colors to highlight the cursor
-                stdscr.addstr(y + 4, x * 2, board[y][x], curses.A_REVERSE)  # Highlight the cursor position
-            else:
-                # If this position is not the cursor, display it normally
-                stdscr.addstr(y + 4, x * 2, board[y][x])
-            # Display the current player's turn below the board
-    stdscr.addstr(BOARD_SIZE + 5, 0, f"Current turn: {'White' if turn == WHITE_PIECE else 'Black'}")
-    stdscr.refresh()# Refresh the screen to show all updates
+    try:
+        stdscr.addstr(0, 0, "Gomoku V1.00", curses.A_BOLD)
+        stdscr.addstr(2, 0, "Use arrow keys to move. Press 'w' to place White, 'b' to place Black. 'q' to quit.")
+    except curses.error:
+        pass  # Ignore if the instructions do not fit on one line
 
     # Draw the board with cursor highlighting
     for y in range(BOARD_SIZE):  # Loop over each row of the board
         for x in range(BOARD_SIZE):  # Loop over each column in the current row
+            pos = y * BOARD_SIZE + x
+            # Highlight the cursor position with reverse video
+            cell = (board[pos], curses.A_REVERSE if x == cursor_x and y == cursor_y else curses.A_NORMAL)
+            if drawn_cells[pos] == cell:
+                continue  # Unchanged since the last frame
             try:
-                if x == cursor_x and y == cursor_y:
-                    # Highlight the cursor position with reverse video
-                    stdscr.addstr(y + 4, x * 2, board[y][x], curses.A_REVERSE)
-                else:
-                    stdscr.addstr(y + 4, x * 2, board[y][x])
+                stdscr.addstr(y + 4, x * 2, PIECE_SYMBOLS[cell[0]], cell[1])
             except curses.error:
                 pass  # Ignore if trying to write outside the window
+            drawn_cells[pos] = cell
 
     # Display the current player's turn below the board
     try:
@@ -234,77 +493,111 @@ def print_board(stdscr: curses.window):
 
     stdscr.refresh()  # Refresh the screen to show all updates
 
-def place_piece(x: int, y: int, player: str):
+def place_piece(pos: int, player: int):
     """
-    Places a piece on the board and updates the hash value
+    Places a piece on the board and updates the hash value and the candidate moves
 
     Args:
-        x, y: Coordinates of the piece
-        player: The player placing the piece ('W' or 'B')
+        pos: Position of the piece
+        player: The player placing the piece (WHITE_PIECE or BLACK_PIECE)
 
     Returns None
 
     """
-    global board_hash
-
     piece = 0 if player == WHITE_PIECE else 1
-    board[y][x] = player
-    board_hash ^= ZOBRIST_TABLE[y][x][piece]
+    board[pos] = player
+    symmetry_hashes[:] = [h ^ key for h, key in zip(symmetry_hashes, ZOBRIST_SYMMETRY[pos][piece])]
+
+    # Every empty cell around the new piece becomes a candidate move
+    for neighbor in NEIGHBORHOODS[pos]:
+        neighbor_counts[neighbor] += 1
+        if board[neighbor] == EMPTY:
+            candidates.add(neighbor)
+    candidates.discard(pos)
     return
 
-def undo_piece(x: int, y: int):
+def undo_piece(pos: int):
     """
-    Undoes a piece placement on the board and updates the hash value
+    Undoes a piece placement on the board and updates the hash value and the candidate moves
 
     Args:
-        x, y: Coordinates of the piece
+        pos: Position of the piece
 
     Returns None
 
     """
-    global board_hash
-
-    piece = 0 if board[y][x] == WHITE_PIECE else 1
-    board[y][x] = EMPTY
-    board_hash ^= ZOBRIST_TABLE[y][x][piece]
+    piece = 0 if board[pos] == WHITE_PIECE else 1
+    board[pos] = EMPTY
+    symmetry_hashes[:] = [h ^ key for h, key in zip(symmetry_hashes, ZOBRIST_SYMMETRY[pos][piece])]
+
+    # Cells left with no piece around them stop being candidate moves
+    for neighbor in NEIGHBORHOODS[pos]:
+        neighbor_counts[neighbor] -= 1
+        if neighbor_counts[neighbor] == 0:
+            candidates.discard(neighbor)
+    if neighbor_counts[pos] > 0:
+        candidates.add(pos)
     return
 
-def check_winner(board: list[list[str]]):
+def check_winner_incremental(board: list[int], pos: int):
     """
-    Checks the board for a winner by looking for five consecutive pieces.
+    Checks whether the piece at pos is part of five consecutive pieces.
+
+    Only the four lines through the most recent move can hold a new five-in-a-row,
+    so no full-board scan is needed.
 
     Args:
         board: The current game board.
+        pos (int): The position of the most recent move.
 
     Returns:
-        The piece type of the winner ('W' or 'B') if a winner is found, else None.
+        The piece type of the winner (WHITE_PIECE or BLACK_PIECE) if a winner is found, else None.
     """
-    for y in range(BOARD_SIZE):
-        for x in range(BOARD_SIZE):
-            if board[y][x] == EMPTY:
-                continue  # Skip empty cells
-            for dx, dy in DIRECTIONS:
-                count = 0  # Initialize count of consecutive pieces
-                for i in range(5):
-                    nx, ny = x + i * dx, y + i * dy
-                    if 0 <= nx < BOARD_SIZE and 0 <= ny < BOARD_SIZE and board[ny][nx] == board[y][x]:
-                        count += 1
-                    else:
-                        break
-                if count == 5:
-                    return board[y][x]  # Winner found
+    piece = board[pos]
+    if piece == EMPTY:
+        return None
+    for center, cells in CELL_RAYS[pos]:
+        # Walk both ways along the line from the piece until the run of its color ends
+        start = center
+        while start > 0 and board[cells[start - 1]] == piece:
+            start -= 1
+        end = center
+        while end < len(cells) - 1 and board[cells[end + 1]] == piece:
+            end += 1
+        if end - start >= 4:
+            return piece  # Winner found
     return None  # No winner
 
-def evaluate_board(board: list[list[str]], player: str):
+def makes_five(board: list[int], pos: int, piece: int):
+    """
+    Checks whether placing a piece on an empty cell would make five in a row.
+
+    Args:
+        board: The current game board.
+        pos (int): The position of the empty cell.
+        piece (int): The piece to try there (WHITE_PIECE or BLACK_PIECE).
+
+    Returns:
+        bool: True if the piece would complete five in a row.
+    """
+    board[pos] = piece  # Only the four lines through the cell are read, so the hashes can be left alone
+    winner = check_winner_incremental(board, pos)
+    board[pos] = EMPTY
+    return winner is not None
+
+def evaluate_board(board: list[int], player: int):
     """
     Evaluate the board and return a score based on the current player's advantage.
 
+    The board must be the game board kept up to date by place_piece and undo_piece,
+    whose running hashes key the evaluation cache.
+
     Positive scores indicate favorability towards the AI player.
     Negative scores indicate favorability towards the opponent.
 
     Args:
         board: The current game board.
-        player: The AI player's piece type ('W' or 'B').
+        player: The AI player's piece type (WHITE_PIECE or BLACK_PIECE).
 
     Returns:
         score (int): The evaluated score of the board.
@@ -313,54 +606,144 @@ def evaluate_board(board: list[list[str]], player: str):
     global hash_use_count
 
     score = 0  # Initialize the score to 0
-    opponent = WHITE_PIECE if player == BLACK_PIECE else BLACK_PIECE
-
-    global trans_table
-    temp_hash = 0
-    piece = 0 if player == WHITE_PIECE else 1
-    opponent_piece = 1 if player == WHITE_PIECE else 0
 
-    for y in range(BOARD_SIZE):
-        for x in range(BOARD_SIZE):
-            if board[y][x] == player:
-                temp_hash ^= ZOBRIST_TABLE[y][x][piece]
-            elif board[y][x] == opponent:
-                temp_hash ^= ZOBRIST_TABLE[y][x][opponent_piece]
+    global eval_table
+    # The running hash already describes the board; the score depends on which side it is scored for
+    temp_hash = symmetry_hashes[0] ^ (SIDE_KEY if player == BLACK_PIECE else 0)
 
-    if temp_hash in trans_table:
-        logging.debug(f'Position already in transposition table, in evaluate_board')
+    if temp_hash in eval_table:
+        if DEBUG_AI:
+            logging.debug('Position already in evaluation table, in evaluate_board')
         hash_use_count += 1
-        return trans_table[temp_hash]
-
-    # Iterate through all cells and evaluate patterns
-    for y in range(BOARD_SIZE):
-        for x in range(BOARD_SIZE):
-            for dx, dy in DIRECTIONS:
-                pattern = []
-                for i in range(MAX_PATTERN_LENGTH):
-                    nx, ny = x + i * dx, y + i * dy
-                    if 0 <= nx < BOARD_SIZE and 0 <= ny < BOARD_SIZE:
-                        piece = board[ny][nx]
-                        if piece == player:
-                            pattern.append(1)
-                        elif piece == opponent:
-                            pattern.append(-1)
-                        else:
-                            pattern.append(0)
-                    else:
-                        pattern.append(-1)  # Out of bounds
-                        break
-                    if (i + 1) in POSSIBLE_PATTERN_LENGTHS: # If current length is in POSSIBLE_PATTERN_LENGTHS
-                        pattern_tuple = tuple(pattern)
-                        if pattern_tuple in PATTERN_DICT:
-                            score += PATTERN_DICT[pattern_tuple]
-    logging.debug(f'Evaluate Board Score for player {player}: {score}')  # Log the evaluation score
-    trans_table[temp_hash] = score
+        return eval_table[temp_hash]
+
+    # Read each line of the board in one call and score every window on it
+    as_player = player.__mul__  # 1 for the AI, -1 for the opponent, 0 if empty
+    for get_line in LINE_GETTERS:
+        score += score_board_line(tuple(map(as_player, get_line(board))))
+    if DEBUG_AI:
+        logging.debug('Evaluate Board Score for player %s: %d', player, score)  # Log the evaluation score
+    eval_table[temp_hash] = score
     state_count += 1
 
     return score
 
-def evaluate_move_position(board: list[list[str]], x: int, y: int, player: str):
+def score_line(line: tuple, center: int):
+    """
+    Scores the pattern windows of a line of cells that cover the cell at index `center`.
+
+    The same line contents come up again and again during a search, so each one is
+    scored only once and remembered in line_table.
+
+    Args:
+        line (tuple): Cells of one line, 1 for the AI, -1 for the opponent and 0 if empty.
+        center (int): The index of the covered cell in `line`.
+
+    Returns:
+        score (int): The summed pattern scores of the covering windows.
+    """
+    key = (center, line)
+    score = line_table.get(key)
+    if score is not None:
+        return score
+
+    if len(line_table) >= LINE_TABLE_LIMIT:
+        line_table.clear()  # Bound memory over a long game
+
+    pattern_score = PATTERN_DICT.get  # Bound once for the loop below
+    score = 0
+    for length in POSSIBLE_PATTERN_LENGTHS:
+        for start in range(max(0, center - length + 1), min(center, len(line) - length) + 1):
+            score += pattern_score(line[start:start + length], 0)
+    line_table[key] = score
+    return score
+
+def score_board_line(line: tuple):
+    """
+    Scores every pattern window of a full board line.
+
+    Most lines are empty or hold the same few pieces from one evaluation to the next,
+    so each one is scored only once and remembered in line_table.
+
+    Args:
+        line (tuple): Cells of the line, 1 for the AI, -1 for the opponent and 0 if empty.
+
+    Returns:
+        score (int): The summed pattern scores of the windows on the line.
+    """
+    key = (None, line)  # No center: every window counts
+    score = line_table.get(key)
+    if score is not None:
+        return score
+
+    if len(line_table) >= LINE_TABLE_LIMIT:
+        line_table.clear()  # Bound memory over a long game
+
+    pattern_score = PATTERN_DICT.get  # Bound once for the loop below
+    score = 0
+    for length in POSSIBLE_PATTERN_LENGTHS:
+        for start in range(len(line) - length + 1):
+            score += pattern_score(line[start:start + length], 0)
+    line_table[key] = score
+    return score
+
+def line_delta(board: list[int], ray: tuple, piece: int, player: int):
+    """
+    Computes how the score along one direction changes when a piece is placed on an empty cell.
+
+    Only the windows covering the cell can change, so the line is read once and scored
+    with the cell empty and with the piece on it.
+
+    Args:
+        board: The current game board.
+        ray (tuple): The (center, cells) entry of CELL_RAYS for the cell and direction.
+        piece (int): The piece being placed (WHITE_PIECE or BLACK_PIECE).
+        player (int): The AI player's piece type (WHITE_PIECE or BLACK_PIECE).
+
+    Returns:
+        delta (int): The change in evaluate_board caused by the move along this direction.
+    """
+    center, cells = ray
+    line = [board[pos] * player for pos in cells]
+
+    before = score_line(tuple(line), center)
+    line[center] = piece * player
+    return score_line(tuple(line), center) - before
+
+def apply_move(board: list[int], pos: int, piece: int, player: int, cur_score: int):
+    """
+    Places a piece and updates the board score by rescoring only the four lines through the move.
+
+    Args:
+        board: The current game board.
+        pos (int): Position of the piece.
+        piece (int): The piece being placed (WHITE_PIECE or BLACK_PIECE).
+        player (int): The AI player's piece type (WHITE_PIECE or BLACK_PIECE).
+        cur_score (int): The evaluated score of the board before the move.
+
+    Returns:
+        score (int): The evaluated score of the board after the move.
+    """
+    for ray in CELL_RAYS[pos]:
+        cur_score += line_delta(board, ray, piece, player)
+    place_piece(pos, piece)
+    return cur_score
+
+def record_cutoff(move: int, depth: int):
+    """
+    Remembers a move that caused an alpha-beta cutoff as a killer move and in the history scores.
+
+    Args:
+        move (int): The position of the move that caused the cutoff.
+        depth (int): The remaining depth at which it was searched.
+    """
+    killers = killer_moves[depth]
+    if killers[0] != move:
+        killers[1] = killers[0]
+        killers[0] = move
+    history_scores[move] += depth * depth
+
+def evaluate_move_position(board: list[int], pos: int, player: int):
     """
     Heuristic to evaluate the desirability of a move position.
     Positive scores indicate favorable positions for the player.
@@ -368,185 +751,460 @@ def evaluate_move_position(board: list[list[str]], x: int, y: int, player: str):
 
     Args:
         board: The current game board.
-        x (int): The x-coordinate of the move.
-        y (int): The y-coordinate of the move.
-        player (str): The player's piece type ('W' or 'B').
+        pos (int): The position of the move.
+        player (int): The player's piece type (WHITE_PIECE or BLACK_PIECE).
 
     Returns:
         score (int): The evaluated score of the move position.
     """
 
-    score = 0
-    opponent = WHITE_PIECE if player == BLACK_PIECE else BLACK_PIECE
+    # Both sides of the cell along each direction, so a run counts the same from either end
+    run_scores = RUN_SCORES[player]
+    right, left, down, up, down_right, up_left, down_left, up_right = STEP_GETTERS[pos]
+    return (run_scores[right(board)] + run_scores[left(board)] + run_scores[down(board)] + run_scores[up(board)]
+            + run_scores[down_right(board)] + run_scores[up_left(board)]
+            + run_scores[down_left(board)] + run_scores[up_right(board)])
 
-    for dx, dy in DIRECTIONS:
-        for i in range(1, 5):  # Check four steps in each direction
-            nx, ny = x + dx * i, y + dy * i
-            if 0 <= nx < BOARD_SIZE and 0 <= ny < BOARD_SIZE:
-                if board[ny][nx] == player:
-                    score += 2  # Friendly piece found
-                elif board[ny][nx] == opponent:
-                    score += 1  # Opponent's piece found
-                else:
-                    break  # Empty space encountered
-            else:
-                score -= 1  # Out of bounds
-    return score
-
-def minimax(board: list[list[str]], depth: int, is_maximizing: bool, player: str,
-            alpha: float, beta: float, start_time: float, last_move: tuple[int, int]):
+def negamax(board: list[int], depth: int, color: int, player: int,
+            alpha: float, beta: float, start_time: float, cur_score: int, allow_null: bool = True):
     """
-    Minimax algorithm with alpha-beta pruning and time constraint.
+    Negamax search with alpha-beta pruning, a transposition table and time constraint.
+
+    Scores are from the point of view of the side to move, so both sides maximize and
+    a child's score is negated (with the window swapped) on its way back up.
 
     Args:
         board: The current game board.
-        depth (int): The current depth in the game tree.
-        is_maximizing (bool): True if the current layer is maximizing, False otherwise.
-        player (str): The AI player's piece type ('W' or 'B').
+        depth (int): The remaining depth of the search.
+        color (int): 1 if the AI player is to move, -1 if its opponent is.
+        player (int): The AI player's piece type (WHITE_PIECE or BLACK_PIECE).
         alpha (float): The alpha value for pruning.
         beta (float): The beta value for pruning.
         start_time (float): The start time of the search.
-        last_move (tuple): The last move made (x, y).
+        cur_score (int): The evaluated score of the current board for the AI, kept up to date by apply_move.
+        allow_null (bool): Whether the side to move may try a null move, False right after one.
 
     Returns:
-        score (int): The evaluated score of the board.
+        score (int): The evaluated score of the board for the side to move.
     """
 
-    global trans_table
     global state_count
     global hash_use_count
 
+    # Probe the transposition table; entries searched at least as deep can narrow the window or end the search
+    # Positions that are rotations or mirror images of each other share the entry of their smallest hash,
+    # and the stored best move is kept in the orientation of that hash
+    alpha_orig, beta_orig = alpha, beta
+    board_key = min(symmetry_hashes)
+    orientation = symmetry_hashes.index(board_key)
+    entry = probe_transposition(board_key)
+    if entry is not None and entry[2] >= depth:
+        _, value, _, flag, _ = entry
+        hash_use_count += 1
+        if DEBUG_AI:
+            logging.debug('Position already in transposition table, in negamax')
+        if flag == EXACT:
+            return value
+        elif flag == LOWER:
+            alpha = max(alpha, value)
+        else:
+            beta = min(beta, value)
+        if alpha >= beta:
+            return value
+
     if time.time() - start_time > TIME_LIMIT:
-        logging.debug("Time limit exceeded during minimax search.")
-        return evaluate_board(board, player)
+        if DEBUG_AI:
+            logging.debug("Time limit exceeded during negamax search.")
+        return color * cur_score
 
-    winner = check_winner(board)
-    if winner == player:
-        return math.inf  # AI wins
-    elif winner is not None:
-        return -math.inf  # Opponent wins
+    # The last move can only have won for the side that made it, which is never the side to move.
+    # Five in a row scores WIN_SCORE, more than all other patterns on the board can add up to,
+    # so apply_move has already shown a win in the score and the board need not be checked.
+    if abs(cur_score) >= WIN_SCORE // 2:
+        return -math.inf
 
     if depth == 0:
-        return evaluate_board(board, player)
-
-    lx, ly = last_move
-    possible_moves: list[tuple[tuple[int, int], int]] = []
-
-    # Generate possible moves within the search radius
-    for y in range(max(0, ly - SEARCH_RADIUS), min(BOARD_SIZE, ly + SEARCH_RADIUS + 1)):
-        for x in range(max(0, lx - SEARCH_RADIUS), min(BOARD_SIZE, lx + SEARCH_RADIUS + 1)):
-            if board[y][x] == EMPTY:
-                move_score = evaluate_move_position(board, x, y, player)
-                possible_moves.append(((x, y), move_score))
-
-    # Sort moves based on heuristic score to improve pruning effectiveness
-    possible_moves.sort(key=lambda move: move[1], reverse=True)
-
-    if is_maximizing:
-        best_score = -math.inf
-        for move, _ in possible_moves:
-            x, y = move
-            place_piece(x, y, player)
-            if board_hash not in trans_table:
-                score = minimax(board, depth - 1, False, player, alpha, beta, start_time, (x, y))
-                trans_table[board_hash] = score
-                state_count += 1
-            else:
-                score = trans_table[board_hash]
-                hash_use_count += 1
-                logging.debug(f'Position already in transposition table, in maximizing layer')
-            undo_piece(x, y)
-            best_score = max(best_score, score)
-            if best_score >= beta:
-                logging.debug("Alpha-beta pruning activated in maximizing layer.")
-                break  # Beta cutoff
-            alpha = max(alpha, best_score)
+        state_count += 1
+        return color * cur_score
+
+    # Null move: if the side to move is already at or above beta and would still be after passing,
+    # a real move would be too. The hashes are flipped with SIDE_KEY while the opponent moves twice in a row.
+    if allow_null and depth > NULL_MOVE_REDUCTION + 1 and beta != math.inf and color * cur_score >= beta:
+        symmetry_hashes[:] = [h ^ SIDE_KEY for h in symmetry_hashes]
+        score = -negamax(board, depth - 1 - NULL_MOVE_REDUCTION, -color, player, -beta, -beta + 1, start_time,
+                         cur_score, allow_null=False)
+        symmetry_hashes[:] = [h ^ SIDE_KEY for h in symmetry_hashes]
+        if score >= beta:
+            return beta
+
+    # Sort the candidate moves by their heuristic, breaking ties with the killer moves and then the history scores,
+    # to improve pruning effectiveness; the list is a snapshot, as the set changes while moves are searched
+    history = history_scores
+    killers = killer_moves[depth]
+    possible_moves = sorted(
+        candidates, key=lambda pos: (evaluate_move_position(board, pos, player), pos in killers, history[pos]),
+        reverse=True)
+
+    # Try the best move stored for this position first, usually found by a shallower iteration
+    if entry is not None and entry[4] is not None:
+        hash_move = INVERSE_SYMMETRIES[orientation][entry[4]]
+        if hash_move in candidates:
+            possible_moves.remove(hash_move)
+            possible_moves.insert(0, hash_move)
+
+    piece = color * player  # Pieces are 1 and -1, so this is the piece of the side to move
+    best_move = None
+    best_score = -math.inf
+    for move in possible_moves:
+        child_score = apply_move(board, move, piece, player, cur_score)
+        if best_move is None or alpha == -math.inf:
+            score = -negamax(board, depth - 1, -color, player, -beta, -alpha, start_time, child_score)
+        else:
+            # Principal variation search: only check that the move is no better than alpha with a null window,
+            # and search it again with the full window if it is
+            score = -negamax(board, depth - 1, -color, player, -alpha - 1, -alpha, start_time, child_score)
+            if alpha < score < beta:
+                score = -negamax(board, depth - 1, -color, player, -beta, -alpha, start_time, child_score)
+        undo_piece(move)
+        if score > best_score:
+            best_score = score
+            best_move = move
+        if best_score >= beta:
+            if DEBUG_AI:
+                logging.debug("Alpha-beta pruning activated.")
+            record_cutoff(move, depth)
+            break  # Beta cutoff
+        alpha = max(alpha, best_score)
+
+    # Store the result with the kind of bound it represents relative to the original window
+    if best_score <= alpha_orig:
+        flag = UPPER
+    elif best_score >= beta_orig:
+        flag = LOWER
     else:
-        opponent = WHITE_PIECE if player == BLACK_PIECE else BLACK_PIECE
-        best_score = math.inf
-        for move, _ in possible_moves:
-            x, y = move
-            place_piece(x, y, opponent)
-            if board_hash not in trans_table:
-                score = minimax(board, depth - 1, True, player, alpha, beta, start_time, (x, y))
-                trans_table[board_hash] = score
-                state_count += 1
-            else:
-                score = trans_table[board_hash]
-                hash_use_count += 1
-                logging.debug(f'Position already in transposition table, in minimizing layer')
-            undo_piece(x, y)
-            best_score = min(best_score, score)
-            if best_score <= alpha:
-                logging.debug("Alpha-beta pruning activated in minimizing layer.")
-                break  # Alpha cutoff
-            beta = min(beta, best_score)
+        flag = EXACT
+    # Results cut short by the time limit are not stored, as the table is kept from one move to the next
+    if time.time() - start_time <= TIME_LIMIT:
+        if best_move is not None:
+            best_move = SYMMETRIES[orientation][best_move]
+        store_transposition(board_key, best_score, depth, flag, best_move)
+    state_count += 1
 
     return best_score
 
-def get_ai_move(board: list[list[str]], player: str, last_move: tuple):
+def search_root_move(board: list[int], move: int, depth: int, player: int, alpha: float, beta: float,
+                     start_time: float, root_score: int, first: bool):
+    """
+    Searches one of the AI's moves at the root.
+
+    Moves after the first are only checked against alpha with a null window, and searched
+    again with the full window if they beat it.
+
+    Args:
+        board: The current game board.
+        move (int): The position of the AI's move.
+        depth (int): The remaining depth below the move.
+        player (int): The AI player's piece type (WHITE_PIECE or BLACK_PIECE).
+        alpha (float): The score the AI is already assured of.
+        beta (float): The score above which the opponent avoids this position.
+        start_time (float): The start time of the search.
+        root_score (int): The evaluated score of the board before the move.
+        first (bool): Whether this is the first move searched, which always gets the full window.
+
+    Returns:
+        score (float): The score of the move for the AI.
+    """
+    child_score = apply_move(board, move, BLACK_PIECE, player, root_score)
+    if first or alpha == -math.inf:
+        score = -negamax(board, depth=depth, color=-1, player=player, alpha=-beta, beta=-alpha,
+                         start_time=start_time, cur_score=child_score)
+    else:
+        # Null-window check against the best move so far, as in negamax
+        score = -negamax(board, depth=depth, color=-1, player=player, alpha=-alpha - 1, beta=-alpha,
+                         start_time=start_time, cur_score=child_score)
+        if alpha < score < beta:
+            score = -negamax(board, depth=depth, color=-1, player=player, alpha=-beta, beta=-alpha,
+                             start_time=start_time, cur_score=child_score)
+    undo_piece(move)
+    return score
+
+def search_root_move_for_position(pieces: list[tuple[int, int]], move: int, depth: int, player: int,
+                                  alpha: float, beta: float, start_time: float, root_score: int):
+    """
+    Sets up a position and searches one root move in it; the entry point of the root search workers.
+
+    Each worker keeps its own transposition table across the root moves and iterations of one AI move;
+    the pool, and with it the table, is started again for the next move.
+
+    Args:
+        pieces (list): One (pos, piece) entry for every piece on the board.
+        move (int): The position of the AI's move.
+        depth (int): The remaining depth below the move.
+        player (int): The AI player's piece type (WHITE_PIECE or BLACK_PIECE).
+        alpha (float): The score the AI is already assured of by the first root move.
+        beta (float): The upper end of the root window.
+        start_time (float): The start time of the search.
+        root_score (int): The evaluated score of the board before the move.
+
+    Returns:
+        score (float), states (int): The score of the move for the AI, and the number of states evaluated.
+    """
+    global state_count
+
+    clear_board()
+    for pos, piece in pieces:
+        place_piece(pos, piece)
+    state_count = 0
+    alpha = max(alpha, root_alpha.value)  # Moves taken up since this search was submitted may have raised it
+    score = search_root_move(board, move, depth, player, alpha, beta, start_time, root_score, first=False)
+    return score, state_count
+
+def init_root_worker(shared_alpha):
+    """
+    Keeps the shared best root score in a new root search worker.
+
+    Args:
+        shared_alpha: A multiprocessing value that the parent raises as root moves are taken up.
+    """
+    global root_alpha
+    root_alpha = shared_alpha
+
+def load_opening_book():
+    """
+    Reads the opening book saved by earlier games.
+
+    Returns:
+        book (dict): Maps the key of a position to its (move, depth), with the move in the orientation of the key;
+        empty if there is no readable book file.
+    """
+    try:
+        with open(OPENING_BOOK_FILE) as book_file:
+            return {int(key): (int(move), int(depth)) for key, (move, depth) in json.load(book_file).items()}
+    except (OSError, ValueError, TypeError, AttributeError):  # AttributeError: valid JSON that is not an object
+        return {}
+
+def save_opening_book():
     """
-    Determines the best move for the AI player using the minimax algorithm with alpha-beta pruning.
+    Writes the opening book to OPENING_BOOK_FILE for later games.
+    """
+    try:
+        with open(OPENING_BOOK_FILE, 'w') as book_file:
+            json.dump({str(key): entry for key, entry in opening_book.items()}, book_file)
+    except OSError as error:
+        logging.warning('Could not save the opening book: %s', error)
+
+def get_ai_move(board: list[int], player: int, last_move: tuple):
+    """
+    Determines the best move for the AI player using iteratively deepened negamax with alpha-beta pruning.
+
+    Each depth searches the best move of the previous depth first, and the result of the
+    deepest completed iteration is returned when the time limit runs out.
+
+    With more than one ROOT_WORKERS, the other root moves wait for the first one to set alpha,
+    and are then searched in parallel in worker processes.
+
+    Early positions found in the opening book are answered without a search.
 
     Args:
         board: The current game board.
-        player (str): The AI player's piece type ('W' or 'B').
+        player (int): The AI player's piece type (WHITE_PIECE or BLACK_PIECE).
         last_move (tuple): The last move made (x, y).
 
     Returns:
         best_move (tuple): The coordinates (x, y) of the best move.
     """
 
-    global trans_table
     global state_count
     global hash_use_count
+    global opening_book
 
     best_move = None
     best_score = -math.inf
     start_time = time.time()
-    alpha = -math.inf
-    beta = math.inf
     lx, ly = last_move
 
-    possible_moves: list[tuple[tuple[int, int], int]] = []
-
-    # Generate possible moves within the search radius
-    for y in range(max(0, ly - SEARCH_RADIUS), min(BOARD_SIZE, ly + SEARCH_RADIUS + 1)):
-        for x in range(max(0, lx - SEARCH_RADIUS), min(BOARD_SIZE, lx + SEARCH_RADIUS + 1)):
-            if board[y][x] == EMPTY:
-                move_score = evaluate_move_position(board, x, y, player)
-                possible_moves.append(((x, y), move_score))
+    # Rotations and mirror images of a position share its book entry, as in the transposition table
+    book_key = None
+    if len(board) - board.count(EMPTY) <= OPENING_BOOK_PLIES:
+        if opening_book is None:
+            opening_book = load_opening_book()
+        book_key = min(symmetry_hashes) ^ (SIDE_KEY if player == BLACK_PIECE else 0)
+        orientation = symmetry_hashes.index(min(symmetry_hashes))
+        entry = opening_book.get(book_key)
+        # A stale or edited book file may hold moves off the board or on occupied cells; those are ignored
+        if entry is not None and entry[1] >= DEPTH and 0 <= entry[0] < BOARD_SIZE * BOARD_SIZE:
+            move = INVERSE_SYMMETRIES[orientation][entry[0]]
+            if board[move] == EMPTY:
+                logging.info('AI played %s from the opening book', (move % BOARD_SIZE, move // BOARD_SIZE))
+                return move % BOARD_SIZE, move // BOARD_SIZE
+
+    # The transposition table is kept, as positions searched last turn come up again; its size is fixed
+    history_scores[:] = [0] * len(history_scores)
+
+    # Score the board once; the search keeps it up to date move by move
+    root_score = evaluate_board(board, player)
+
+    # Consider the cells around the pieces on the board, or around the last move on an empty board;
+    # a full board has no candidates either, and leaves no move to make
+    if candidates:
+        cells = list(candidates)
+    elif board.count(EMPTY) == len(board):
+        cells = [ly * BOARD_SIZE + lx, *NEIGHBORHOODS[ly * BOARD_SIZE + lx]]
+    else:
+        logging.debug('AI found no empty cell to play.')
+        return None
+    possible_moves: list[tuple[int, int]] = [(pos, evaluate_move_position(board, pos, player)) for pos in cells]
 
     # Sort moves based on heuristic score to prioritize better moves
-    possible_moves.sort(key=lambda move: move[1], reverse=True)
-
-    for move, _ in possible_moves:
-        if time.time() - start_time > TIME_LIMIT:
-            if not best_move:
-                logging.debug("No best move chosen. Selecting best move by heuristic")
-                return possible_moves[0][0]
-            logging.debug("Time limit exceeded before completing all move evaluations.")
-            break
-
-        x, y = move
-        place_piece(x, y, BLACK_PIECE)
-        if board_hash not in trans_table:
-            score = minimax(board, depth=DEPTH, is_maximizing=False, player=player, alpha=alpha, beta=beta,
-                       start_time=start_time, last_move=(x, y))
-            trans_table[board_hash] = score
-            state_count += 1
-        else:
-            score = trans_table[board_hash]
-            hash_use_count += 1
-            logging.debug(f'Position already in transposition table, in get_ai_move')
-        undo_piece(x, y)
+    possible_moves.sort(key=BY_SCORE, reverse=True)
+    root_scores: dict[int, float] = {}  # Scores of the root moves in the last iteration
 
-        logging.debug(f'AI evaluating move at ({x}, {y}) with score {score}')
+    # Take a five at once; failing that, the cells where the opponent would make five are the only moves left
+    winning_moves = [move for move in possible_moves if makes_five(board, move[0], player)]
+    if winning_moves:
+        possible_moves = winning_moves[:1]
+    else:
+        blocking_moves = [move for move in possible_moves if makes_five(board, move[0], -player)]
+        if blocking_moves:
+            possible_moves = blocking_moves
+
+    # Moves that lead to rotations or mirror images of the same position are worth the same,
+    # so only the first move of each is searched; on a nearly empty board this removes most of the root
+    reached_keys = set()
+    unique_moves = []
+    for move in possible_moves:
+        key = min(h ^ k for h, k in zip(symmetry_hashes, ZOBRIST_SYMMETRY[move[0]][1]))  # Keys of a Black piece
+        if key not in reached_keys:
+            reached_keys.add(key)
+            unique_moves.append(move)
+    possible_moves = unique_moves
+    searched_depth = 0  # Deepest iteration that finished
+
+    # Worker processes for the root moves after the first, each started with its own copy of the board
+    executor = None
+    pieces: list[tuple[int, int]] = []
+    shared_alpha = None
+    if ROOT_WORKERS > 1 and len(possible_moves) > 1:
+        shared_alpha = multiprocessing.RawValue('d', -math.inf)  # Written only by this process
+        executor = ProcessPoolExecutor(max_workers=ROOT_WORKERS, initializer=init_root_worker,
+                                       initargs=(shared_alpha,))
+        pieces = [(pos, piece) for pos, piece in enumerate(board) if piece != EMPTY]
+
+    # A single move needs no search
+    if len(possible_moves) == 1:
+        best_move = possible_moves[0][0]
+        best_score = root_score
 
-        if score > best_score:
-            best_score = score
-            best_move = (x, y)
-            alpha = max(alpha, best_score)  # Update alpha for pruning
+    try:
+        for depth in range(1, DEPTH + 1 if len(possible_moves) > 1 else 1):
+            if time.time() - start_time > TIME_LIMIT:
+                if DEBUG_AI:
+                    logging.debug('Time limit exceeded before starting depth %d.', depth)
+                break
+
+            # Search the moves in the order of their scores in the previous iteration, its best move first;
+            # moves it did not reach keep their heuristic order behind them
+            if root_scores:
+                possible_moves.sort(key=lambda move: root_scores.get(move[0], -math.inf), reverse=True)
+            if best_move is not None:
+                possible_moves.sort(key=lambda move: move[0] != best_move)
+            root_scores = {}
+
+            # Killer moves are tied to a remaining depth, which is a different ply in every iteration,
+            # and older cutoffs count for less in the history scores
+            for killers in killer_moves:
+                killers[:] = [None, None]
+            history_scores[:] = [score // 2 for score in history_scores]
+
+            # Search a narrow window around the previous score first, and the full window if the score falls outside it
+            if best_move is not None and abs(best_score) < WIN_SCORE:
+                window_alpha, window_beta = best_score - ASPIRATION_WINDOW, best_score + ASPIRATION_WINDOW
+            else:
+                window_alpha, window_beta = -math.inf, math.inf
+
+            while True:
+                iteration_move = None
+                iteration_score = -math.inf
+                alpha = window_alpha
+                beta = window_beta
+                completed = True
+
+                pending: list[Future] = []  # Searches of the root moves after the first in the worker processes
+                if shared_alpha is not None:
+                    shared_alpha.value = alpha
+                for index, (move, _) in enumerate(possible_moves):
+                    if time.time() - start_time > TIME_LIMIT:
+                        if DEBUG_AI:
+                            logging.debug("Time limit exceeded before completing all move evaluations.")
+                        completed = False
+                        break
+
+                    if executor is not None and index > 0:
+                        # The first move has set alpha, so submit all the others at once and take their results in order
+                        if not pending:
+                            pending = [executor.submit(search_root_move_for_position, pieces, other, depth, player,
+                                                       alpha, beta, start_time, root_score)
+                                       for other, _ in possible_moves[1:]]
+                        score, states = pending[index - 1].result()
+                        state_count += states
+                    else:
+                        score = search_root_move(board, move, depth, player, alpha, beta, start_time, root_score,
+                                                 first=iteration_move is None)
+                    root_scores[move] = score
+
+                    if DEBUG_AI:
+                        y, x = divmod(move, BOARD_SIZE)
+                        logging.debug('AI evaluating move at (%d, %d) with score %s at depth %d', x, y, score, depth)
+
+                    if score > iteration_score:
+                        iteration_score = score
+                        iteration_move = move
+                        alpha = max(alpha, iteration_score)  # Update alpha for pruning
+                        if shared_alpha is not None:
+                            shared_alpha.value = alpha  # Searches yet to start in the workers begin from it
+                    if iteration_score >= beta:
+                        break  # Fail high, the score is only a lower bound
+                for future in pending:
+                    future.cancel()  # Searches not started yet are no longer needed
+                # The move being searched when the time ran out was cut short, so its score cannot be trusted
+                if time.time() - start_time > TIME_LIMIT:
+                    completed = False
+
+                # On a miss, open only the side of the window the score fell out of and search again
+                if completed and iteration_score <= window_alpha != -math.inf:
+                    if DEBUG_AI:
+                        logging.debug('Aspiration window failed low at depth %d, searching again.', depth)
+                    window_alpha = -math.inf
+                    continue
+                if completed and iteration_score >= window_beta != math.inf:
+                    if DEBUG_AI:
+                        logging.debug('Aspiration window failed high at depth %d, searching again.', depth)
+                    window_beta = math.inf
+                    continue
+                break
+
+            # Keep a partial iteration only if no earlier iteration finished
+            if completed or best_move is None:
+                if iteration_move is not None:
+                    best_move, best_score = iteration_move, iteration_score
+            if not completed:
+                break
+            searched_depth = depth
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    if best_move is None and possible_moves:
+        logging.debug("No best move chosen. Selecting best move by heuristic")
+        best_move = possible_moves[0][0]
+    if best_move is None:
+        return None
+
+    if book_key is not None and searched_depth >= DEPTH:
+        opening_book[book_key] = (SYMMETRIES[orientation][best_move], searched_depth)
+        save_opening_book()
+
+    best_move = (best_move % BOARD_SIZE, best_move // BOARD_SIZE)  # Back to (x, y) for the caller
 
     logging.info(f'AI selected move: {best_move} with score {best_score}')
     logging.info(f'AI took {time.time() - start_time} seconds to select move')
@@ -555,6 +1213,44 @@ def get_ai_move(board: list[list[str]], player: str, last_move: tuple):
 
     return best_move
 
+def log_board():
+    """
+    Writes the board to the log, one row per line, when DEBUG_AI is set.
+    """
+    if not DEBUG_AI:
+        return
+    logging.info('Current board state:')
+    for row in range(0, len(board), BOARD_SIZE):
+        logging.info(' '.join(PIECE_SYMBOLS[piece] for piece in board[row:row + BOARD_SIZE]))
+
+def clear_board():
+    """
+    Removes every piece from the board, undoing its effect on the hashes and the candidate moves.
+    """
+    for pos, piece in enumerate(board):
+        if piece != EMPTY:
+            undo_piece(pos)
+
+def get_ai_move_for_position(pieces: list[tuple[int, int]], player: int, last_move: tuple):
+    """
+    Sets up a position and determines the AI's move in it; the entry point of the AI's worker process.
+
+    The worker has its own copy of the board, hashes and candidate moves, so the position
+    is rebuilt from scratch before every search.
+
+    Args:
+        pieces (list): One (pos, piece) entry for every piece on the board.
+        player (int): The AI player's piece type (WHITE_PIECE or BLACK_PIECE).
+        last_move (tuple): The last move made (x, y).
+
+    Returns:
+        best_move (tuple): The coordinates (x, y) of the best move.
+    """
+    clear_board()
+    for pos, piece in pieces:
+        place_piece(pos, piece)
+    return get_ai_move(board, player, last_move)
+
 def main(stdscr: curses.window, game_mode: str):
     """
     The main game loop handling user input, AI moves, and game state updates.
@@ -567,120 +1263,134 @@ def main(stdscr: curses.window, game_mode: str):
     global move_count
     last_player_move = (7, 7)  # Initialize last_player_move to center
 
-    # Setup curses settings
-    curses.curs_set(0)  # Hide the default cursor
-    stdscr.keypad(True)  # Enable special keys (like arrow keys) to be read directly
-    stdscr.clear()  # Clear the screen to start fresh
-    stdscr.refresh()  # Apply the clear to the display
-
-    # Display initial board and instructions
-    print_board(stdscr)
-
-    while True:  # Main game loop
-
-        if game_mode == "ai" and turn == BLACK_PIECE:  # AI's turn
-            ai_move = get_ai_move(board, BLACK_PIECE, last_player_move)  # Get AI's move
-            if ai_move:  # If the AI returned a valid move
-                x, y = ai_move
-                place_piece(x, y, BLACK_PIECE)
-                move_count += 1
-                last_player_move = (x, y)  # Update last_player_move
-                winner = check_winner(board)
-                logging.info(f'AI placed at ({x}, {y}). Current board state:')
-                for row in board:
-                    logging.info(' '.join(row))
-                if winner == BLACK_PIECE:
-                    print_board(stdscr)
-                    try:
-                        stdscr.addstr(BOARD_SIZE + 6, 0, "Black (AI) wins!", curses.A_BOLD)
-                    except curses.error:
-                        pass  # Ignore if out of bounds
-                    stdscr.refresh()
-                    stdscr.getch()
-                    logging.info(f'Peak memory used by program was {tracemalloc.get_traced_memory()[1]/1000000:.2f} MB.')
-                    logging.info(f'This game lasted {move_count} moves.')
-                    tracemalloc.stop()
-                    break
-                turn = WHITE_PIECE  # Switch turn to White
-                print_board(stdscr)
-                continue  # Continue to next iteration
-            else:
-                logging.debug(f'AI found no valid move.')
-                break
+    # In AI mode the AI searches in a separate process, started as soon as White has moved,
+    # so the board stays responsive to the cursor keys and 'q' while the AI is thinking
+    ai_executor = ProcessPoolExecutor(max_workers=1) if game_mode == "ai" else None
+    ai_future: Future | None = None
 
+    # The worker process is shut down however the game ends, including sys.exit in print_board
+    try:
+        # Setup curses settings
+        curses.curs_set(0)  # Hide the default cursor
+        stdscr.keypad(True)  # Enable special keys (like arrow keys) to be read directly
+        stdscr.clear()  # Clear the screen to start fresh
+        stdscr.refresh()  # Apply the clear to the display
 
-        try:
-            key = stdscr.getch()  # Wait for user input
-        except KeyboardInterrupt:
-            break  # Allow graceful exit on Ctrl+C
-
-        # Handle quit command
-        if key == ord('q'):
-            break
-
-        # Movement commands using arrow keys
-        elif key == curses.KEY_RIGHT:
-            cursor_x = (cursor_x + 1) % BOARD_SIZE
-        elif key == curses.KEY_LEFT:
-            cursor_x = (cursor_x - 1) % BOARD_SIZE
-        elif key == curses.KEY_DOWN:
-            cursor_y = (cursor_y + 1) % BOARD_SIZE
-        elif key == curses.KEY_UP:
-            cursor_y = (cursor_y - 1) % BOARD_SIZE
-
-        # Initialize last player move to cursor position
-        last_player_move = (cursor_x, cursor_y)
-
-        # Place a White piece if it's White's turn
-        if key == ord('w') and turn == WHITE_PIECE:
-            if board[cursor_y][cursor_x] == EMPTY:
-                place_piece(cursor_x, cursor_y, WHITE_PIECE)
-                move_count += 1
-                last_player_move = (cursor_x, cursor_y)
-                winner = check_winner(board)
-                logging.info(f'Player (White) placed at ({cursor_x}, {cursor_y}). Current board state:')
-                for row in board:
-                    logging.info(' '.join(row))
-                if winner == WHITE_PIECE:
-                    print_board(stdscr)
-                    try:
-                        stdscr.addstr(BOARD_SIZE + 6, 0, "White wins!", curses.A_BOLD)
-                    except curses.error:
-                        pass  # Ignore if out of bounds
-                    stdscr.refresh()
-                    stdscr.getch()
-                    logging.info(f'Peak memory used by program was {tracemalloc.get_traced_memory()[1]/1000000:.2f} MB.')
-                    logging.info(f'This game lasted {move_count} moves.')
-                    tracemalloc.stop()
-                    break
-                turn = BLACK_PIECE  # Switch turn to Black
-
-        # Place a Black piece if it's Black's turn in PvP mode
-        if game_mode == "pvp" and key == ord('b') and turn == BLACK_PIECE:
-            if board[cursor_y][cursor_x] == EMPTY:
-                place_piece(cursor_x, cursor_y, BLACK_PIECE)
-                move_count += 1
-                last_player_move = (cursor_x, cursor_y)
-                winner = check_winner(board)
-                logging.info(f'Player (Black) placed at ({cursor_x}, {cursor_y}). Current board state:')
-                for row in board:
-                    logging.info(' '.join(row))
-                if winner == BLACK_PIECE:
+        # Display initial board and instructions
+        print_board(stdscr)
+
+        while True:  # Main game loop
+
+            # AI's turn, once the search started after White's move has finished; until then keys are read as usual
+            if game_mode == "ai" and turn == BLACK_PIECE and ai_future.done():
+                ai_move = ai_future.result()
+                ai_future = None
+                stdscr.timeout(-1)  # Block on getch again while waiting for White
+                if ai_move:  # If the AI returned a valid move
+                    x, y = ai_move
+                    place_piece(y * BOARD_SIZE + x, BLACK_PIECE)
+                    move_count += 1
+                    last_player_move = (x, y)  # Update last_player_move
+                    winner = check_winner_incremental(board, y * BOARD_SIZE + x)
+                    logging.info(f'AI placed at ({x}, {y})')
+                    log_board()
+                    if winner == BLACK_PIECE:
+                        print_board(stdscr)
+                        try:
+                            stdscr.addstr(BOARD_SIZE + 6, 0, "Black (AI) wins!", curses.A_BOLD)
+                        except curses.error:
+                            pass  # Ignore if out of bounds
+                        stdscr.refresh()
+                        stdscr.getch()
+                        logging.info(f'Peak memory used by program was {tracemalloc.get_traced_memory()[1]/1000000:.2f} MB.')
+                        logging.info(f'This game lasted {move_count} moves.')
+                        tracemalloc.stop()
+                        break
+                    turn = WHITE_PIECE  # Switch turn to White
                     print_board(stdscr)
-                    try:
-                        stdscr.addstr(BOARD_SIZE + 6, 0, "Black wins!", curses.A_BOLD)
-                    except curses.error:
-                        pass  # Ignore if out of bounds
-                    stdscr.refresh()
-                    stdscr.getch()
-                    logging.info(f'Peak memory used by program was {tracemalloc.get_traced_memory()[1]/1000000:.2f} MB.')
-                    logging.info(f'This game lasted {move_count} moves.')
-                    tracemalloc.stop()
+                    continue  # Continue to next iteration
+                else:
+                    logging.debug('AI found no valid move.')
                     break
-                turn = WHITE_PIECE  # Switch turn to White
 
-        # Refresh the board display after each action
-        print_board(stdscr)
+
+            try:
+                key = stdscr.getch()  # Wait for user input
+            except KeyboardInterrupt:
+                break  # Allow graceful exit on Ctrl+C
+
+            # Handle quit command
+            if key == ord('q'):
+                break
+
+            # Movement commands using arrow keys
+            elif key == curses.KEY_RIGHT:
+                cursor_x = (cursor_x + 1) % BOARD_SIZE
+            elif key == curses.KEY_LEFT:
+                cursor_x = (cursor_x - 1) % BOARD_SIZE
+            elif key == curses.KEY_DOWN:
+                cursor_y = (cursor_y + 1) % BOARD_SIZE
+            elif key == curses.KEY_UP:
+                cursor_y = (cursor_y - 1) % BOARD_SIZE
+
+            # Initialize last player move to cursor position
+            last_player_move = (cursor_x, cursor_y)
+
+            # Place a White piece if it's White's turn
+            if key == ord('w') and turn == WHITE_PIECE:
+                if board[cursor_y * BOARD_SIZE + cursor_x] == EMPTY:
+                    place_piece(cursor_y * BOARD_SIZE + cursor_x, WHITE_PIECE)
+                    move_count += 1
+                    last_player_move = (cursor_x, cursor_y)
+                    winner = check_winner_incremental(board, cursor_y * BOARD_SIZE + cursor_x)
+                    logging.info(f'Player (White) placed at ({cursor_x}, {cursor_y})')
+                    log_board()
+                    if winner == WHITE_PIECE:
+                        print_board(stdscr)
+                        try:
+                            stdscr.addstr(BOARD_SIZE + 6, 0, "White wins!", curses.A_BOLD)
+                        except curses.error:
+                            pass  # Ignore if out of bounds
+                        stdscr.refresh()
+                        stdscr.getch()
+                        logging.info(f'Peak memory used by program was {tracemalloc.get_traced_memory()[1]/1000000:.2f} MB.')
+                        logging.info(f'This game lasted {move_count} moves.')
+                        tracemalloc.stop()
+                        break
+                    turn = BLACK_PIECE  # Switch turn to Black
+                    if ai_executor is not None:
+                        pieces = [(pos, piece) for pos, piece in enumerate(board) if piece != EMPTY]
+                        ai_future = ai_executor.submit(get_ai_move_for_position, pieces, BLACK_PIECE, last_player_move)
+                        stdscr.timeout(AI_POLL_INTERVAL)  # Let getch return now and then to check on the search
+
+            # Place a Black piece if it's Black's turn in PvP mode
+            if game_mode == "pvp" and key == ord('b') and turn == BLACK_PIECE:
+                if board[cursor_y * BOARD_SIZE + cursor_x] == EMPTY:
+                    place_piece(cursor_y * BOARD_SIZE + cursor_x, BLACK_PIECE)
+                    move_count += 1
+                    last_player_move = (cursor_x, cursor_y)
+                    winner = check_winner_incremental(board, cursor_y * BOARD_SIZE + cursor_x)
+                    logging.info(f'Player (Black) placed at ({cursor_x}, {cursor_y})')
+                    log_board()
+                    if winner == BLACK_PIECE:
+                        print_board(stdscr)
+                        try:
+                            stdscr.addstr(BOARD_SIZE + 6, 0, "Black wins!", curses.A_BOLD)
+                        except curses.error:
+                            pass  # Ignore if out of bounds
+                        stdscr.refresh()
+                        stdscr.getch()
+                        logging.info(f'Peak memory used by program was {tracemalloc.get_traced_memory()[1]/1000000:.2f} MB.')
+                        logging.info(f'This game lasted {move_count} moves.')
+                        tracemalloc.stop()
+                        break
+                    turn = WHITE_PIECE  # Switch turn to White
+
+            # Refresh the board display after each action
+            print_board(stdscr)
+    finally:
+        if ai_executor is not None:
+            ai_executor.shutdown(wait=False, cancel_futures=True)  # Do not hold up quitting for a running search
 
 # Run the banner and curses wrapper to initiate the main loop
 if __name__ == "__main__":